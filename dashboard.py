@@ -1,10 +1,8 @@
 import streamlit as st
 import os
-from PIL import Image
-import json
-import pandas as pd
-import plotly.express as px
-from src.ai_insights import get_ai_insights
+
+# Heavy libraries (pandas, plotly, groq) are imported inside the page branches that use them,
+# so switching to a light page doesn't pay for imports it never needs
 
 # ==========================================
 # CONFIGURATION
@@ -16,11 +14,12 @@ st.set_page_config(
 )
 
 
-# Function to load image safely
+# Function to locate a chart safely
+# Returns the PNG path (not a decoded PIL image): st.image serves the file bytes as-is
 def load_chart(filename):
     path = os.path.join("output", filename)
     if os.path.exists(path):
-        return Image.open(path)
+        return path
     else:
         return None
 
@@ -40,6 +39,12 @@ st.sidebar.info("Data Source: UIDAI Anonymised Dataset 2025")
 
 
 if page == "Executive Summary":
+    import json
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import plotly.express as px
+
     st.title("Aadhaar Identity Health Engine")
     st.markdown("### National Level Status Report")
 
@@ -58,22 +63,39 @@ if page == "Executive Summary":
         "Hover over a district to view its **Identity Health Index** and **Risk Category**."
     )
 
-    @st.cache_data
-    def load_data():
-        df = pd.read_csv("output/final_health_index.csv")
-        with open("data/india_district.geojson", "r", encoding="utf-8") as f:
-            geojson = json.load(f)
-        return df, geojson
-
-    df, india_geojson = load_data()
-
-    def clean_name(x):
-        if pd.isna(x):
-            return x
-        return str(x).replace("*", "").strip().title()
+    # GeoJSON is immutable reference data: cache_resource shares one parsed copy
+    # across reruns/sessions instead of pickling a deep copy on every access
+    @st.cache_resource
+    def load_geojson():
+        with open("data/india_district.geojson", "rb") as f:
+            return json.load(f)
 
-    df["district_clean"] = df["district"].apply(clean_name)
-    df["state_clean"] = df["state"].apply(clean_name)
+    @st.cache_data
+    def load_health_df():
+        # Prefer the Parquet written by main.py; fall back to the CSV export
+        if os.path.exists("output/final_health_index.parquet"):
+            return pd.read_parquet("output/final_health_index.parquet", dtype_backend="pyarrow")
+        return pd.read_csv("output/final_health_index.csv", engine="pyarrow", dtype_backend="pyarrow")
+
+    # Keep only the geometries we can actually colour: fewer features for Plotly to
+    # match against `locations` and a much smaller payload shipped to the browser
+    @st.cache_resource
+    def load_district_geojson(districts):
+        geojson = load_geojson()
+        present = set(districts)
+        features = [f for f in geojson["features"] if f["properties"].get("NAME_2") in present]
+        return {**geojson, "features": features}
+
+    df = load_health_df()
+
+    def clean_name(s):
+        # Vectorized on the Arrow-backed column: one kernel pass per op, no per-row Python calls
+        # (the Parquet export stores names dictionary-encoded, so decode to plain strings first)
+        return s.astype(pd.ArrowDtype(pa.string())).str.replace("*", "", regex=False).str.strip().str.title()
+
+    df["district_clean"] = clean_name(df["district"])
+    df["state_clean"] = clean_name(df["state"])
+    india_geojson = load_district_geojson(tuple(sorted(df["district_clean"].dropna().unique())))
 
     state_fix = {
         "Nct Of Delhi": "Delhi",
@@ -82,15 +104,11 @@ if page == "Executive Summary":
     }
     df["state_clean"] = df["state_clean"].replace(state_fix)
 
-    df["risk_category_clean"] = df["risk_category"]
-
-    zero_activity_mask = (
-        (df["enrol_total_vol"] == 0) &
-        (df["bio_total_vol"] == 0) &
-        (df["demo_total_vol"] == 0)
-    )
-
-    df.loc[zero_activity_mask, "risk_category_clean"] = "No Data / Inactive"
+    # One fused pass over the (N, 3) volume block flags districts with no activity at all
+    totals = df[["enrol_total_vol", "bio_total_vol", "demo_total_vol"]].to_numpy(dtype="float64")
+    inactive = (totals == 0).all(axis=1)
+    df["risk_category_clean"] = np.where(inactive, "No Data / Inactive", df["risk_category"].to_numpy())
+    df["total_vol"] = totals.sum(axis=1)
 
     risk_colors = {
         "Critical Risk": "#d7191c",
@@ -99,8 +117,23 @@ if page == "Executive Summary":
         "No Data / Inactive": "#bdbdbd" # grey
     }
 
+    # Compact the frame before Plotly serializes it to JSON for the browser:
+    # dictionary-encode repeated labels, halve the float width and ship only the plotted columns
+    df["state_clean"] = df["state_clean"].astype("category")
+    df["risk_category_clean"] = pd.Categorical(df["risk_category_clean"], categories=list(risk_colors))
+    df["health_index"] = df["health_index"].astype("float32")
+    # The map colours one polygon per district name, so collapse duplicate names
+    # (e.g. "Kendrapara" and "Kendrapara *") into one row each before Plotly sees them.
+    # Each name keeps its busiest row, so state, index and category all come from that
+    # same row; a zero-activity duplicate only wins when the name has no active row at all
+    plot_df = (
+        df.sort_values("total_vol", ascending=False, kind="stable")
+        .drop_duplicates("district_clean")
+        [["district_clean", "state_clean", "health_index", "risk_category_clean"]]
+    )
+
     fig = px.choropleth(
-    df,
+    plot_df,
     geojson=india_geojson,
     locations="district_clean",
     featureidkey="properties.NAME_2",
@@ -379,6 +412,8 @@ elif page == "Risk & Security":
 
 
 elif page == "AI Interpretation":
+    from src.ai_insights import get_ai_insights
+
     st.title(" AI-Powered Business Insights for UIDAI")
     
     st.divider()
@@ -1,5 +1,16 @@
+import glob
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import MemoryHandler
+
+import pandas as pd
+
+from src.config import DATA_DIR, OUTPUT_DIR
 from src.analyzer import (
-    load_and_engineer_data,  # Core Engine: Loads data, runs EDA (Charts 1 & 2), generates features
+    CLEAN_CACHE_VERSION,  # Bumped on cleaning/feature changes: also invalidates the feature cache below
+    get_pincode_features,  # Core Engine (memoized): Loads data, runs EDA (Charts 1 & 2), generates features
     generate_health_index,  # Solution: ML Clustering (Chart 4)
     analyze_mbu_gap,  # Insight: Child Risk (Chart 5)
     analyze_fraud_spikes,  # Security: Fraud Sentinel (Chart 7)
@@ -10,65 +21,153 @@ from src.analyzer import (
 # If you created src/time_forensics.py, uncomment the next line to get Chart 6
 # from src.time_forensics import run_time_forensics
 
+# Engineered pincode features from the last run (invalidated when any raw CSV is newer,
+# or when the analyzer's CLEAN_CACHE_VERSION changes: the version is part of the filename)
+FEATURE_CACHE = os.path.join(OUTPUT_DIR, f"_engineered_v{CLEAN_CACHE_VERSION}.parquet")
+
+
+def load_features_cached():
+    """
+    Reuses the engineered feature set while the raw CSVs are unchanged,
+    skipping the full load + EDA + feature-engineering pass on reruns.
+    """
+    raw_files = glob.glob(os.path.join(DATA_DIR, "*.csv"))
+    if raw_files and os.path.exists(FEATURE_CACHE):
+        if os.path.getmtime(FEATURE_CACHE) > max(os.path.getmtime(f) for f in raw_files):
+            logging.info(f"Reusing cached features from {FEATURE_CACHE} (EDA charts 1 & 2 from the previous run).")
+            return pd.read_parquet(FEATURE_CACHE)
+
+    df = get_pincode_features()
+    if not df.empty:
+        # Drop feature caches written by other versions before storing the fresh one
+        for old in glob.glob(os.path.join(OUTPUT_DIR, "_engineered*.parquet")):
+            os.remove(old)
+        df.to_parquet(FEATURE_CACHE, index=False)
+    return df
+
+
+def build_health_index(df):
+    """
+    Step 3 worker: builds the health index (Chart 4) and writes the CSV/Parquet exports.
+    """
+    health_df = generate_health_index(df)
+    health_df.to_csv("output/final_health_index.csv", index=False)
+    # Typed, compressed copy for the dashboard (skips CSV tokenization on load)
+    health_df.to_parquet("output/final_health_index.parquet", compression="zstd", index=False)
+    return health_df
+
+
+def configure_logging():
+    """
+    Routes status messages to stdout through one buffered handler: lines are batched
+    and written per flush (errors flush immediately) instead of one write per message.
+    Returns the buffer to flush, or None when the caller already configured logging.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, MemoryHandler):
+            return handler
+    if root.handlers:
+        return None
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    buffer = MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=console)
+    logging.basicConfig(level=logging.INFO, handlers=[buffer])
+    return buffer
+
+
 def main():
-    print("===========================================")
-    print("   UIDAI IDENTITY HEALTH ENGINE (MASTER)   ")
-    print("===========================================\n")
+    log_buffer = configure_logging()
+
+    def flush_log():
+        # Written out after the banner and each step, so status lines keep their
+        # place among the analyzer's own progress prints
+        if log_buffer is not None:
+            log_buffer.flush()
+
+    try:
+        run_pipeline(flush_log)
+    finally:
+        flush_log()
+
+
+def run_pipeline(flush_log):
+    logging.info("===========================================")
+    logging.info("   UIDAI IDENTITY HEALTH ENGINE (MASTER)   ")
+    logging.info("===========================================\n")
+    flush_log()
 
     # ---------------------------------------------------------
     # STEP 1: LOAD & ENGINEER FEATURES
     # ---------------------------------------------------------
     # This automatically runs Independent EDA (Charts 1 & 2) inside the function
+    # (skipped when the cached feature set is still fresh)
     try:
-        df_pincode_features = load_and_engineer_data()
+        df_pincode_features = load_features_cached()
 
         if df_pincode_features.empty:
-            print("CRITICAL ERROR: No data processed. Check your CSV files in 'data/'.")
+            logging.error("CRITICAL ERROR: No data processed. Check your CSV files in 'data/'.")
             return
 
-        print(f"SUCCESS: Feature Engineering Complete. Processed {len(df_pincode_features)} Pincode records.")
+        logging.info(f"SUCCESS: Feature Engineering Complete. Processed {len(df_pincode_features)} Pincode records.")
+        flush_log()
     except Exception as e:
-        print(f"CRITICAL ERROR during loading: {e}")
+        logging.error(f"CRITICAL ERROR during loading: {e}")
         return
 
-    # ---------------------------------------------------------
-    # STEP 2: ANALYZE INEQUALITY (Chart 8)
-    # ---------------------------------------------------------
-    # Shows that even within a busy district, some pincodes do 0 work
-    analyze_pincode_variance(df_pincode_features)
-    print("[ANALYSIS] Chart 8: Pincode Variance Map generated.")
+    # Steps 2-5 are independent (each writes its own chart/CSV), so they run in
+    # parallel worker processes; results are reported below in pipeline order.
+    with ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as pool:
+        variance_job = pool.submit(analyze_pincode_variance, df_pincode_features)
+        health_job = pool.submit(build_health_index, df_pincode_features)
+        mbu_job = pool.submit(analyze_mbu_gap, df_pincode_features)
+        sentinel_job = pool.submit(analyze_fraud_spikes)
 
-    # ---------------------------------------------------------
-    # STEP 3: RUN THE ML SOLUTION (Chart 4)
-    # ---------------------------------------------------------
-    # Uses K-Means to cluster districts into Critical/Moderate/Healthy
-    health_df = generate_health_index(df_pincode_features)
-    health_df.to_csv("output/final_health_index.csv", index=False)
+        # ---------------------------------------------------------
+        # STEP 2: ANALYZE INEQUALITY (Chart 8)
+        # ---------------------------------------------------------
+        # Shows that even within a busy district, some pincodes do 0 work
+        variance_job.result()
+        logging.info("[ANALYSIS] Chart 8: Pincode Variance Map generated.")
+        flush_log()
 
-    print("[SOLUTION] Chart 4: Identity Health Index Generated via ML Clustering.")
-    critical = health_df[health_df['risk_category'] == 'Critical Risk']
-    print(f"ALERT: {len(critical)} Districts flagged as 'Critical Risk' (High Volume / Low Compliance).")
+        # ---------------------------------------------------------
+        # STEP 3: RUN THE ML SOLUTION (Chart 4)
+        # ---------------------------------------------------------
+        # Uses K-Means to cluster districts into Critical/Moderate/Healthy
+        health_df = health_job.result()
 
-    if not critical.empty:
-        print(">>> Top 3 Critical Districts to Audit:")
-        print(critical[['state', 'district', 'health_index']].head(3).to_string(index=False))
+        logging.info("[SOLUTION] Chart 4: Identity Health Index Generated via ML Clustering.")
+        critical = health_df[health_df['risk_category'] == 'Critical Risk']
+        logging.info(f"ALERT: {len(critical)} Districts flagged as 'Critical Risk' (High Volume / Low Compliance).")
 
-    # ---------------------------------------------------------
-    # STEP 4: ANALYZE CHILD RISK (Chart 5)
-    # ---------------------------------------------------------
-    # Identifies districts where children enroll but never update biometrics
-    analyze_mbu_gap(df_pincode_features)
-    print("[INSIGHT] Chart 5: Child 'Silent ID' Risk Map saved.")
+        if not critical.empty:
+            logging.info(">>> Top 3 Critical Districts to Audit:")
+            # nsmallest picks the 3 worst scores without relying on the frame's current order
+            top3 = critical.nsmallest(3, 'health_index')[['state', 'district', 'health_index']]
+            for row in top3.itertuples(index=False):
+                logging.info(f"{row.state:<20} {row.district:<25} {row.health_index:6.1f}")
+        flush_log()
 
-    # ---------------------------------------------------------
-    # STEP 5: RUN SECURITY SENTINEL (Chart 7)
-    # ---------------------------------------------------------
-    # Detects daily volume spikes > 3 Sigma (Z-Score)
-    analyze_fraud_spikes()
-    print("\n==========================================")
-    print("   PIPELINE COMPLETE. ALL CHARTS SAVED.")
-    print("   CHECK THE 'output/' FOLDER.")
-    print("==========================================")
+        # ---------------------------------------------------------
+        # STEP 4: ANALYZE CHILD RISK (Chart 5)
+        # ---------------------------------------------------------
+        # Identifies districts where children enroll but never update biometrics
+        mbu_job.result()
+        logging.info("[INSIGHT] Chart 5: Child 'Silent ID' Risk Map saved.")
+        flush_log()
+
+        # ---------------------------------------------------------
+        # STEP 5: RUN SECURITY SENTINEL (Chart 7)
+        # ---------------------------------------------------------
+        # Detects daily volume spikes > 3 Sigma (Z-Score)
+        sentinel_job.result()
+        flush_log()
+
+    logging.info("\n==========================================")
+    logging.info("   PIPELINE COMPLETE. ALL CHARTS SAVED.")
+    logging.info("   CHECK THE 'output/' FOLDER.")
+    logging.info("==========================================")
 
 
 if __name__ == "__main__":
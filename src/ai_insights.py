@@ -1,130 +1,122 @@
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import os
+import tempfile
+import time
 from dotenv import load_dotenv
-from groq import Groq
-
-
-class AIInsightsGenerator:
-    """Generate business insights using Groq API"""
+from groq import AsyncGroq
+
+# Exact-match cache of Groq responses: identical model + messages + sampling params
+# reuse the stored report instead of paying another multi-second round trip.
+# OUTPUT_PATH is read directly (same .env and default as src.config) rather than importing
+# src.config, whose directory checks would fail this module's import.
+load_dotenv()
+LLM_CACHE_PATH = os.path.join(os.getenv("OUTPUT_PATH", "output/"), ".llm_cache.json")
+DEFAULT_LLM_CACHE_TTL = 7 * 24 * 3600  # seconds; override with LLM_CACHE_TTL (0 disables)
+
+
+# Per-chart findings fed to the LLM. Static, so built once at import rather than per call.
+_GRAPH_INSIGHTS = {
+    "chart_1_enrolment_trends": {
+        "title": "Enrolment Temporal Consistency",
+        "key_findings": [
+            "Child enrolments show strong seasonality with sharp peaks around August-September",
+            "Adult enrolments remain consistently low with only minor month-to-month variation",
+            "Child enrolments are driven by academic admission cycles and school calendars",
+            "Adult enrolments are need-based and less dependent on fixed timelines"
+        ],
+        "implications": [
+            "Seasonal dependence makes child enrolment vulnerable to short-term disruptions",
+            "Adult enrolments provide a stable baseline demand across the year",
+            "Capacity planning must account for 4x spike during school admission periods"
+        ]
+    },
     
-    def __init__(self):
-        load_dotenv()
-        api_key = os.getenv('api_key')
-        
-        if not api_key or api_key == 'your_groq_api_key_here':
-            raise ValueError(
-                "⚠️ Groq API key not found! Please add your API key to the .env file.\n"
-                "Get your key from: https://console.groq.com/keys"
-            )
-        
-        self.client = Groq(api_key=api_key)
+    "chart_2_biometric_splits": {
+        "title": "Biometric Update Distribution (Child vs Adult)",
+        "key_findings": [
+            "Nearly 50-50 split between child and adult biometric updates",
+            "Children's biometrics change rapidly and require periodic updates",
+            "Adults require far fewer updates over time"
+        ],
+        "implications": [
+            "A near-50 split is NOT healthy parity - it signals systemic under-updating of child biometrics",
+            "Silent accumulation of outdated child records",
+            "Increased risk of future authentication failures for children",
+            "Gaps in awareness, access, or operational prioritization"
+        ]
+    },
     
-    def get_graph_insights(self):
+    "chart_4_health_clusters": {
+        "title": "Identity Health Clusters (Machine Learning)",
+        "key_findings": [
+            "Districts classified into Critical Risk, Moderate, and Healthy clusters",
+            "High Aadhaar volume does NOT guarantee system health",
+            "Compliance and stability matter more than transaction volume",
+            "Large districts below trend line are failing despite scale"
+        ],
+        "implications": [
+            "Some large districts process massive volumes but fail to maintain biometric freshness",
+            "Large failing districts are highest-value targets for audits",
+            "Infrastructure alone doesn't ensure operational success",
+            "Need compliance checks and fraud monitoring for high-volume low-health districts"
+        ]
+    },
     
-        return {
-            "chart_1_enrolment_trends": {
-                "title": "Enrolment Temporal Consistency",
-                "key_findings": [
-                    "Child enrolments show strong seasonality with sharp peaks around August-September",
-                    "Adult enrolments remain consistently low with only minor month-to-month variation",
-                    "Child enrolments are driven by academic admission cycles and school calendars",
-                    "Adult enrolments are need-based and less dependent on fixed timelines"
-                ],
-                "implications": [
-                    "Seasonal dependence makes child enrolment vulnerable to short-term disruptions",
-                    "Adult enrolments provide a stable baseline demand across the year",
-                    "Capacity planning must account for 4x spike during school admission periods"
-                ]
-            },
-            
-            "chart_2_biometric_splits": {
-                "title": "Biometric Update Distribution (Child vs Adult)",
-                "key_findings": [
-                    "Nearly 50-50 split between child and adult biometric updates",
-                    "Children's biometrics change rapidly and require periodic updates",
-                    "Adults require far fewer updates over time"
-                ],
-                "implications": [
-                    "A near-50 split is NOT healthy parity - it signals systemic under-updating of child biometrics",
-                    "Silent accumulation of outdated child records",
-                    "Increased risk of future authentication failures for children",
-                    "Gaps in awareness, access, or operational prioritization"
-                ]
-            },
-            
-            "chart_4_health_clusters": {
-                "title": "Identity Health Clusters (Machine Learning)",
-                "key_findings": [
-                    "Districts classified into Critical Risk, Moderate, and Healthy clusters",
-                    "High Aadhaar volume does NOT guarantee system health",
-                    "Compliance and stability matter more than transaction volume",
-                    "Large districts below trend line are failing despite scale"
-                ],
-                "implications": [
-                    "Some large districts process massive volumes but fail to maintain biometric freshness",
-                    "Large failing districts are highest-value targets for audits",
-                    "Infrastructure alone doesn't ensure operational success",
-                    "Need compliance checks and fraud monitoring for high-volume low-health districts"
-                ]
-            },
-            
-            "chart_5_child_risk_zones": {
-                "title": "Child Identity Risk Zones (Enrolment-Update Gap)",
-                "key_findings": [
-                    "Large gaps between child enrolments and biometric updates in specific districts",
-                    "Children enrolled in Aadhaar but fail to complete mandatory biometric updates",
-                    "Top risk districts: Pune, Delhi, West Champaran, Bangalore Urban"
-                ],
-                "implications": [
-                    "Aadhaar enrolment without updates creates silent identity failure",
-                    "Service denial in PDS, DBT, and scholarships",
-                    "Increased risk of identity misuse or proxy authentication",
-                    "System overestimates true identity coverage",
-                    "High migration, urban churn, and geographic barriers contribute to gaps"
-                ]
-            },
-            
-            "chart_7_anomaly_detection": {
-                "title": "Automated Fraud Detection (Security Sentinel)",
-                "key_findings": [
-                    "Z-score based algorithm flags abnormal daily transaction spikes (>3σ)",
-                    "Massive spike on 01 March flagged as >3σ anomaly",
-                    "Low false-positive rate - routine fluctuations stay within ±2σ"
-                ],
-                "implications": [
-                    "True anomalies isolated without noise",
-                    "Enables proactive fraud response and rapid audits",
-                    "Damage containment before systemic impact",
-                    "Explainable, statistically sound, and scalable approach"
-                ]
-            },
-            
-            "chart_8_pincode_variance": {
-                "title": "Intra-District Inequality (Pincode Workload Distribution)",
-                "key_findings": [
-                    "High Coefficient of Variation (CV = 0.96) indicates severe intra-district imbalance",
-                    "Small number of pincodes handle disproportionately high workload",
-                    "Urban and high-density pincodes attract more transactions"
-                ],
-                "implications": [
-                    "Districts may appear functional overall but hide severe service overload at specific pincodes",
-                    "Uneven workload creates service pressure in high-demand areas",
-                    "Underutilized capacity persists in peripheral areas",
-                    "Need for pincode-level staff and resource reallocation"
-                ]
-            }
-        }
+    "chart_5_child_risk_zones": {
+        "title": "Child Identity Risk Zones (Enrolment-Update Gap)",
+        "key_findings": [
+            "Large gaps between child enrolments and biometric updates in specific districts",
+            "Children enrolled in Aadhaar but fail to complete mandatory biometric updates",
+            "Top risk districts: Pune, Delhi, West Champaran, Bangalore Urban"
+        ],
+        "implications": [
+            "Aadhaar enrolment without updates creates silent identity failure",
+            "Service denial in PDS, DBT, and scholarships",
+            "Increased risk of identity misuse or proxy authentication",
+            "System overestimates true identity coverage",
+            "High migration, urban churn, and geographic barriers contribute to gaps"
+        ]
+    },
     
-    def generate_business_insights(self):
-        """
-        Generate comprehensive business insights for UIDAI
-        using all graph interpretations as context
-        """
-        
-        graph_insights = self.get_graph_insights()
-        
-        # Create comprehensive prompt for Gemini
-        prompt = f"""
+    "chart_7_anomaly_detection": {
+        "title": "Automated Fraud Detection (Security Sentinel)",
+        "key_findings": [
+            "Z-score based algorithm flags abnormal daily transaction spikes (>3σ)",
+            "Massive spike on 01 March flagged as >3σ anomaly",
+            "Low false-positive rate - routine fluctuations stay within ±2σ"
+        ],
+        "implications": [
+            "True anomalies isolated without noise",
+            "Enables proactive fraud response and rapid audits",
+            "Damage containment before systemic impact",
+            "Explainable, statistically sound, and scalable approach"
+        ]
+    },
+    
+    "chart_8_pincode_variance": {
+        "title": "Intra-District Inequality (Pincode Workload Distribution)",
+        "key_findings": [
+            "High Coefficient of Variation (CV = 0.96) indicates severe intra-district imbalance",
+            "Small number of pincodes handle disproportionately high workload",
+            "Urban and high-density pincodes attract more transactions"
+        ],
+        "implications": [
+            "Districts may appear functional overall but hide severe service overload at specific pincodes",
+            "Uneven workload creates service pressure in high-demand areas",
+            "Underutilized capacity persists in peripheral areas",
+            "Need for pincode-level staff and resource reallocation"
+        ]
+    }
+}
+
+
+def _build_prompt(graph_insights):
+    """Render the report prompt from the per-chart findings."""
+    return f"""
 You are a senior data consultant providing strategic insights to UIDAI (Unique Identification Authority of India) leadership tp help them Improve the Aadhaar identity system and support informed decision-making and system improvements.
 
 Based on the analysis of 6 different aspects of the Aadhaar identity system, generate a comprehensive business report in PLAIN ENGLISH that can be understood by non-technical UIDAI officials and policy makers.
@@ -205,18 +197,90 @@ TOP 3 RECOMMENDED ACTIONS
 
 Make it compelling, data-driven, and actionable for UIDAI leadership.
 """
+
+
+# The prompt only depends on the static findings above, so render it once at import
+_PROMPT_TEMPLATE = _build_prompt(_GRAPH_INSIGHTS)
+
+
+def _cache_key(request):
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _load_cache():
+    try:
+        with open(LLM_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _cache_get(key):
+    ttl = float(os.getenv("LLM_CACHE_TTL", DEFAULT_LLM_CACHE_TTL))
+    if ttl <= 0:
+        return None
+    entry = _load_cache().get(key)
+    if entry and time.time() - entry["created"] < ttl:
+        return entry["content"]
+    return None
+
+
+def _cache_put(key, content):
+    cache = _load_cache()
+    cache[key] = {"created": time.time(), "content": content}
+    # Write-then-rename so a crash mid-write never leaves a truncated cache file;
+    # each writer gets its own temp file, so concurrent sessions can't clobber each other's
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(LLM_CACHE_PATH) or ".",
+                                     prefix=".llm_cache.", suffix=".tmp", delete=False) as f:
+        json.dump(cache, f)
+    try:
+        os.replace(f.name, LLM_CACHE_PATH)
+    except OSError:
+        os.remove(f.name)
+        raise
+
+
+class AIInsightsGenerator:
+    """Generate business insights using Groq API"""
+    
+    def __init__(self):
+        load_dotenv()
+        api_key = os.getenv('api_key')
         
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a senior data consultant for UIDAI. Be concise, focus on quality over quantity. Every recommendation must have clear reasoning."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=4000
+        if not api_key or api_key == 'your_groq_api_key_here':
+            raise ValueError(
+                "⚠️ Groq API key not found! Please add your API key to the .env file.\n"
+                "Get your key from: https://console.groq.com/keys"
             )
-            return response.choices[0].message.content
+        
+        # The AsyncGroq client is opened per event loop (see the *_async methods): its
+        # connection pool is bound to the loop that created it
+        self.api_key = api_key
+    
+    def get_graph_insights(self):
+        return _GRAPH_INSIGHTS
+    
+    async def _complete(self, client, prompt):
+        """
+        Send one report prompt to Groq (or serve it from the response cache)
+        """
+        request = {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {"role": "system", "content": "You are a senior data consultant for UIDAI. Be concise, focus on quality over quantity. Every recommendation must have clear reasoning."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.5,
+            "max_tokens": 4000
+        }
+        key = _cache_key(request)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await client.chat.completions.create(**request)
+            content = response.choices[0].message.content
         
         except Exception as e:
             return f"""
@@ -227,6 +291,43 @@ There was an issue connecting to Groq API: {str(e)}
 
 
 """
+        
+        # The cache is best-effort: a failed write must never discard a good report
+        try:
+            _cache_put(key, content)
+        except OSError:
+            pass
+        return content
+    
+    async def generate_business_insights_async(self):
+        """
+        Generate comprehensive business insights for UIDAI
+        using all graph interpretations as context
+        """
+        # Prompt is pre-rendered at import (see _PROMPT_TEMPLATE)
+        async with AsyncGroq(api_key=self.api_key) as client:
+            return await self._complete(client, _PROMPT_TEMPLATE)
+    
+    async def generate_many(self, prompts):
+        """
+        Generate several reports (e.g. per-state variants) concurrently.
+        The calls are network-bound, so they overlap instead of running back to back.
+        """
+        async with AsyncGroq(api_key=self.api_key) as client:
+            return await asyncio.gather(*(self._complete(client, p) for p in prompts))
+    
+    def generate_business_insights(self):
+        """
+        Blocking wrapper around generate_business_insights_async for sync callers
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.generate_business_insights_async())
+        # Called from inside a running loop (Jupyter, an async caller): asyncio.run
+        # would raise there, so run the report on a fresh loop in a helper thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.generate_business_insights_async()).result()
 
 
 def get_ai_insights():
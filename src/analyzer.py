@@ -1,29 +1,56 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless: charts are only written to PNG, never shown
 import matplotlib.pyplot as plt
 import seaborn as sns
+import functools
 import glob
+import hashlib
 import os
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.cluster import KMeans
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+from src.arrow_utils import CSV_COLUMN_TYPES, dictionary_encode
 from src.config import DATA_DIR, OUTPUT_DIR
 
+# Fixed label set for the health index (same order as the dashboard risk_colors legend)
+RISK_CATEGORIES = ['Critical Risk', 'Moderate', 'Healthy', 'No Data / Inactive']
+
+# Pincode-level spatial keys (stored as categoricals once cleaned)
+SPATIAL_KEYS = ['state', 'district', 'pincode']
+
+# Parquet snapshots of cleaned domain frames, keyed by the source chunks' name/size/mtime.
+# Bump CLEAN_CACHE_VERSION whenever clean_standardize or the feature engineering changes
+# what it produces (main.py's engineered-feature cache is keyed on it too).
+CLEAN_CACHE_DIR = os.path.join(DATA_DIR, "_cache")
+CLEAN_CACHE_VERSION = 4
+
+# Charts are working outputs, not print assets: fast zlib level instead of PIL's default 6
+PNG_PIL_KWARGS = {'compress_level': 1}
+
 
 # =============================================================================
 # UTILITY: Load and Clean (Standardized)
 # =============================================================================
 def load_and_combine_chunks(file_pattern):
     search_path = os.path.join(DATA_DIR, file_pattern)
-    files = glob.glob(search_path)
-    dfs = []
-    for f in files:
-        try:
-            df = pd.read_csv(f)
-            dfs.append(df)
-        except:
-            pass
-    if not dfs: return pd.DataFrame()
-    return pd.concat(dfs, ignore_index=True)
+    files = sorted(glob.glob(search_path))
+    if not files: return pd.DataFrame()
+
+    # Scan all chunks as one Arrow dataset: multithreaded C++ CSV parsing straight
+    # into a single table, instead of a Python loop of read_csv + concat
+    csv_format = ds.CsvFileFormat(convert_options=pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES))
+    try:
+        table = ds.dataset(files, format=csv_format).to_table()
+    except pa.ArrowException as e:
+        print(f"ERROR: Could not read {file_pattern}: {e}")
+        raise
+    # Strings stay Arrow-backed (vectorized .str kernels); counts convert to plain
+    # NumPy ints so plotting, np.where and sklearn see ordinary arrays
+    return table.to_pandas(types_mapper={pa.string(): pd.ArrowDtype(pa.string())}.get)
 
 
 def clean_standardize(df, prefix):
@@ -42,20 +69,70 @@ def clean_standardize(df, prefix):
     df = df.rename(columns=rename_map)
 
     # 2. String Normalization (Crucial for Merging)
-    df['state'] = df['state'].str.title().str.strip()
+    # Runs as pyarrow.compute kernels over the Arrow buffer (no per-row Python str objects)
+    state = pc.utf8_trim_whitespace(pc.utf8_title(pa.array(df['state'])))
     # Garbage Filter: Remove states with numbers (Data Quality Control)
-    df = df[~df['state'].str.contains(r'\d', regex=True, na=False)]
+    # The regex runs once per distinct state name (dictionary-encoded), then is gathered back per row
+    encoded = dictionary_encode(state)
+    has_digit = pc.take(pc.match_substring_regex(encoded.dictionary, r'\d'), encoded.indices)
+    keep = pc.invert(pc.fill_null(has_digit, False))
 
     state_map = {'Westbengal': 'West Bengal', 'Orissa': 'Odisha', 'Uttaranchal': 'Uttarakhand', 'Delhi': 'NCT Of Delhi', 'Tamilnadu': 'Tamil Nadu'}
-    df['state'] = df['state'].replace(state_map)
+    # Exact-match remap: index each value into the map keys, take the replacement, else keep as-is
+    mapped = pc.take(pa.array(list(state_map.values())),
+                     pc.index_in(state, value_set=pa.array(list(state_map.keys()))))
+    df['state'] = pd.arrays.ArrowExtensionArray(pc.coalesce(mapped, state))
+    df = df[keep.to_numpy(zero_copy_only=False)]
 
     # 3. Temporal Standardization
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-    df['month'] = df['date'].dt.to_period('M')
+    # Dates repeat heavily (many pincodes per day): parse each distinct string once, then gather
+    codes, unique_dates = pd.factorize(df['date'], use_na_sentinel=False)
+    parsed = pd.DatetimeIndex(pd.to_datetime(unique_dates, format='%d-%m-%Y', errors='coerce'))
+    df['date'] = parsed.take(codes).array
+    df['month'] = parsed.to_period('M').take(codes).array
+
+    # 4. Categorical spatial keys: groupby/merge hash small int codes instead of strings
+    for col in SPATIAL_KEYS:
+        df[col] = df[col].astype('category')
+
+    return df
+
 
+def load_clean_domain(file_pattern, prefix):
+    """
+    Loads + cleans one domain, reusing a Parquet snapshot of the cleaned frame
+    while the raw chunks are unchanged (skips CSV parsing and cleaning on reruns).
+    """
+    files = sorted(glob.glob(os.path.join(DATA_DIR, file_pattern)))
+    fingerprint = repr((CLEAN_CACHE_VERSION, file_pattern, prefix,
+                        [(os.path.basename(f), os.path.getsize(f), os.path.getmtime(f)) for f in files]))
+    digest = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+    cache_path = os.path.join(CLEAN_CACHE_DIR, f"{prefix}_{digest}.parquet")
+
+    if os.path.exists(cache_path):
+        # Parquet only round-trips string dictionaries as categoricals; re-apply for pincode
+        return pd.read_parquet(cache_path).astype({col: 'category' for col in SPATIAL_KEYS})
+
+    df = clean_standardize(load_and_combine_chunks(file_pattern), prefix)
+    if not df.empty:
+        os.makedirs(CLEAN_CACHE_DIR, exist_ok=True)
+        # Drop stale snapshots of this domain before writing the fresh one
+        for old in glob.glob(os.path.join(CLEAN_CACHE_DIR, f"{prefix}_*.parquet")):
+            os.remove(old)
+        df.to_parquet(cache_path, compression='zstd', index=False)
     return df
 
 
+def _save_figures(figures):
+    """
+    Writes (figure, filename) pairs into OUTPUT_DIR with the fast PNG settings, then closes them.
+    Saved one after another: Matplotlib rendering is not documented as thread-safe.
+    """
+    for fig, filename in figures:
+        fig.savefig(os.path.join(OUTPUT_DIR, filename), pil_kwargs=PNG_PIL_KWARGS)
+        plt.close(fig)
+
+
 # =============================================================================
 # STEP 3: INDEPENDENT EDA (Before Processing)
 # =============================================================================
@@ -66,104 +143,177 @@ def run_independent_eda(df_enrol, df_bio, df_demo):
     """
     print("Running Independent EDA (Step 3)...")
 
+    figures = []
+
     # A. Enrolment Trend (Time Series Decomposition check)
     if not df_enrol.empty:
         trend = df_enrol.groupby('month')[['enrol_child', 'enrol_adult']].sum()
-        plt.figure(figsize=(10, 5))
-        trend.plot(kind='line', marker='o')
-        plt.title('Enrolment Temporal Consistency')
-        plt.xlabel('Month')
-        plt.ylabel('Volume')
-        plt.grid(True, alpha=0.3)
-        plt.savefig(os.path.join(OUTPUT_DIR, 'EDA_1_Enrolment_Trend.png'))
-        plt.close()
+        fig, ax = plt.subplots(figsize=(10, 5))
+        trend.plot(kind='line', marker='o', ax=ax)
+        ax.set_title('Enrolment Temporal Consistency')
+        ax.set_xlabel('Month')
+        ax.set_ylabel('Volume')
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        figures.append((fig, 'EDA_1_Enrolment_Trend.png'))
 
     # B. Biometric Gap (Child vs Adult Ratio)
     if not df_bio.empty:
         bio_sum = df_bio[['bio_child', 'bio_adult']].sum()
-        plt.figure(figsize=(6, 6))
-        bio_sum.plot(kind='pie', autopct='%1.1f%%', colors=['#ff9999', '#66b3ff'])
-        plt.title('Biometric Update Distribution (Target vs Actual)')
-        plt.savefig(os.path.join(OUTPUT_DIR, 'EDA_2_Bio_Split.png'))
-        plt.close()
+        fig, ax = plt.subplots(figsize=(6, 6))
+        bio_sum.plot(kind='pie', autopct='%1.1f%%', colors=['#ff9999', '#66b3ff'], ax=ax)
+        ax.set_title('Biometric Update Distribution (Target vs Actual)')
+        figures.append((fig, 'EDA_2_Bio_Split.png'))
+
+    _save_figures(figures)
 
 
 # =============================================================================
 # STEP 1 & 4: PINCODE FEATURE ENGINEERING (The "Core Layer")
 # =============================================================================
-def process_domain_features(df, prefix, val_cols):
+# Per-domain value columns, in the feature-set column order
+DOMAIN_VALUE_COLS = {
+    'enrol': ['enrol_child', 'enrol_adult'],
+    'bio': ['bio_child', 'bio_adult'],
+    'demo': ['demo_child', 'demo_adult'],
+}
+
+
+def _shared_key_dtypes(frames, keys):
     """
-    Calculates statistical moments (Sum, Std) at Pincode level.
-    This preserves granular signal without memory explosion.
+    One sorted category set per key across all frames, so concat/merge keep
+    the categorical codes instead of falling back to comparing strings.
     """
-    if df.empty: return pd.DataFrame()
+    dtypes = {}
+    for col in keys:
+        categories = frames[0][col].cat.categories
+        for f in frames[1:]:
+            categories = categories.union(f[col].cat.categories)
+        dtypes[col] = pd.CategoricalDtype(categories)
+    return dtypes
 
-    # Group by Pincode to get spatial features
-    # We aggregate TIME (Month) here to get Pincode Stability
-    stats = df.groupby(['state', 'district', 'pincode'])[val_cols].agg(['sum', 'std']).reset_index()
 
-    # Flatten MultiIndex columns
-    stats.columns = ['state', 'district', 'pincode'] + [f'{c}_{stat}' for c in val_cols for stat in ['sum', 'std']]
+def _stack_domains(present, key_dtypes):
+    """
+    Builds the stacked domain frame one column at a time: key codes are concatenated
+    with np.concatenate and each value column is one NaN buffer filled in at its
+    domain's row slice (no per-domain astype copies or pd.concat).
+    """
+    offsets = np.cumsum([0] + [len(df) for df in present.values()])
+    columns = {}
+    for col in SPATIAL_KEYS:
+        codes = np.concatenate([df[col].astype(key_dtypes[col]).cat.codes.to_numpy()
+                                for df in present.values()])
+        columns[col] = pd.Categorical.from_codes(codes, dtype=key_dtypes[col])
+    for (prefix, df), start, stop in zip(present.items(), offsets[:-1], offsets[1:]):
+        for c in DOMAIN_VALUE_COLS[prefix]:
+            values = np.full(offsets[-1], np.nan)
+            values[start:stop] = df[c].to_numpy(dtype=np.float64)
+            columns[c] = values
+    return pd.DataFrame(columns)
+
+
+def process_domain_features(stats, prefix, val_cols):
+    """
+    Derives a domain's Total Volume and Stability from its pincode-level Sum/Std columns.
+    """
+    # One 2-D block per statistic: row sums run in NumPy without per-column Series temporaries
+    sums = stats[[f'{c}_sum' for c in val_cols]].to_numpy(dtype=np.float64)
+    stds = stats[[f'{c}_std' for c in val_cols]].to_numpy(dtype=np.float64)
 
     # Calculate Domain Total for this pincode
-    sum_cols = [c for c in stats.columns if 'sum' in c]
-    stats[f'{prefix}_total_vol'] = stats[sum_cols].sum(axis=1)
+    # (NaN = pincode absent from this domain, counted as 0 like the pandas row sum)
+    total_vol = np.nansum(sums, axis=1)
+    total_std = np.nansum(stds, axis=1)
 
     # Calculate Stability (Inverse Coefficient of Variation)
     # CV = sigma / mu. Stability = 1 / CV.
-    std_cols = [c for c in stats.columns if 'std' in c]
-    total_std = stats[std_cols].sum(axis=1)
-    # Add epsilon to avoid div by zero
-    stats[f'{prefix}_stability'] = np.where(stats[f'{prefix}_total_vol'] > 0,
-                                            1 / ((total_std / (stats[f'{prefix}_total_vol'] + 1)) + 0.1),
-                                            0)
+    # Add epsilon to avoid div by zero; where= skips the inactive pincodes entirely
+    stability = np.divide(1, (total_std / (total_vol + 1)) + 0.1,
+                          out=np.zeros(len(stats)), where=total_vol > 0)
+
+    stats[f'{prefix}_total_vol'] = total_vol
+    stats[f'{prefix}_stability'] = stability
+    return stats
+
+
+def build_pincode_features(domains):
+    """
+    Calculates statistical moments (Sum, Std) at Pincode level for all domains at once.
+    This preserves granular signal without memory explosion.
+    `domains` maps prefix -> cleaned domain frame.
+    """
+    present = {prefix: df for prefix, df in domains.items() if not df.empty}
+    if not present: return pd.DataFrame()
+
+    # Stack the domains vertically: each row carries only its own domain's values
+    # (NaN elsewhere), so one groupby replaces three groupbys plus two outer joins.
+    key_dtypes = _shared_key_dtypes(list(present.values()), SPATIAL_KEYS)
+    combined = _stack_domains(present, key_dtypes)
+
+    # Group by Pincode to get spatial features
+    # We aggregate TIME (Month) here to get Pincode Stability
+    # observed=True: only emit key combinations that exist (not the categorical cartesian product)
+    val_cols = [c for prefix in present for c in DOMAIN_VALUE_COLS[prefix]]
+    stats = combined.groupby(SPATIAL_KEYS, observed=True)[val_cols].agg(['sum', 'std']).reset_index()
+
+    # Flatten MultiIndex columns
+    stats.columns = SPATIAL_KEYS + [f'{c}_{stat}' for c in val_cols for stat in ['sum', 'std']]
+
+    columns = list(SPATIAL_KEYS)
+    for prefix in present:
+        stats = process_domain_features(stats, prefix, DOMAIN_VALUE_COLS[prefix])
+        columns += [f'{c}_{stat}' for c in DOMAIN_VALUE_COLS[prefix] for stat in ['sum', 'std']]
+        columns += [f'{prefix}_total_vol', f'{prefix}_stability']
+
+    # Pincodes missing from a domain (and single-row std) come out as NaN
+    stats = stats[columns]
+    value_cols = columns[len(SPATIAL_KEYS):]
+    stats[value_cols] = stats[value_cols].fillna(0)
     return stats
 
 
 def load_and_engineer_data():
     print("Building Pincode-Level Feature Set...")
 
-    # 1. Load Raw
-    raw_enrol = load_and_combine_chunks("api_data_aadhar_enrolment_*.csv")
-    raw_bio = load_and_combine_chunks("api_data_aadhar_biometric_*.csv")
-    raw_demo = load_and_combine_chunks("api_data_aadhar_demographic_*.csv")
-
-    # 2. Clean
-    df_enrol = clean_standardize(raw_enrol, 'enrol')
-    df_bio = clean_standardize(raw_bio, 'bio')
-    df_demo = clean_standardize(raw_demo, 'demo')
+    # 1 & 2. Load Raw + Clean (served from the Parquet cache when the chunks are unchanged)
+    df_enrol = load_clean_domain("api_data_aadhar_enrolment_*.csv", 'enrol')
+    df_bio = load_clean_domain("api_data_aadhar_biometric_*.csv", 'bio')
+    df_demo = load_clean_domain("api_data_aadhar_demographic_*.csv", 'demo')
 
     # 3. Run EDA
     run_independent_eda(df_enrol, df_bio, df_demo)
 
-    # 4. Feature Engineering (Per Domain)
+    # 4 & 5. Feature Engineering (Per Domain), merged at Pincode level
     # This replaces the "Total Activity" sum. We treat them separately.
-    feat_enrol = process_domain_features(df_enrol, 'enrol', ['enrol_child', 'enrol_adult'])
-    feat_bio = process_domain_features(df_bio, 'bio', ['bio_child', 'bio_adult'])
-    feat_demo = process_domain_features(df_demo, 'demo', ['demo_child', 'demo_adult'])
+    return build_pincode_features({'enrol': df_enrol, 'bio': df_bio, 'demo': df_demo})
 
-    # 5. Merge Features (Pincode Level)
-    # Outer Join on spatial keys
-    keys = ['state', 'district', 'pincode']
-    master = feat_enrol
 
-    if master.empty:
-        master = feat_bio
-    elif not feat_bio.empty:
-        master = pd.merge(master, feat_bio, on=keys, how='outer')
-
-    if master.empty:
-        master = feat_demo
-    elif not feat_demo.empty:
-        master = pd.merge(master, feat_demo, on=keys, how='outer')
-
-    master = master.fillna(0)
-    return master
+@functools.lru_cache(maxsize=1)
+def get_pincode_features():
+    """
+    Memoized load_and_engineer_data: the pincode feature set is built at most once per process.
+    Every caller gets the same frame, so the analyze_* steps must not modify it in place.
+    """
+    return load_and_engineer_data()
 
 
 # =============================================================================
 # STEP 5: REBUILD INDEX & CLUSTERING
 # =============================================================================
+def _mm(a):
+    """
+    Min-max scales a 1-D array to [0, 1] (same result as MinMaxScaler on one column,
+    without sklearn's per-call validation and 2-D copies). A constant column scales to 0.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    lo = a.min()
+    span = a.max() - lo
+    if span == 0:
+        return np.zeros_like(a)
+    return (a - lo) / span
+
+
 def generate_health_index(df):
     """
     Constructs the Identity Health Index using Weighted Linear Combination.
@@ -172,7 +322,7 @@ def generate_health_index(df):
     print("Generating Weighted Health Index (Step 5)...")
 
     # We aggregate to District Level for the Final Index Reporting
-    dist_stats = df.groupby(['state', 'district']).agg({
+    dist_stats = df.groupby(['state', 'district'], observed=True).agg({
         'enrol_total_vol': 'sum',
         'enrol_stability': 'mean',  # Mean stability of pincodes in district
         'bio_total_vol': 'sum',
@@ -182,37 +332,35 @@ def generate_health_index(df):
         'bio_child_sum': 'sum'
     }).reset_index()
 
-    scaler = MinMaxScaler()
+    # Domain volumes as one float64 block: every score below reads 1-D NumPy columns directly
+    volumes = dist_stats[['enrol_total_vol', 'bio_total_vol', 'demo_total_vol']].to_numpy(dtype=np.float64)
+    enrol_vol, bio_vol, demo_vol = volumes.T
 
     # A. Access Score (Enrolment)
     # Weight: 0.30
-    # Note: double brackets [['col']] return a DataFrame, so no reshape needed
-    s_enrol_vol = scaler.fit_transform(dist_stats[['enrol_total_vol']]).flatten()
-    s_enrol_stab = scaler.fit_transform(dist_stats[['enrol_stability']]).flatten()
+    s_enrol_vol = _mm(enrol_vol)
+    s_enrol_stab = _mm(dist_stats['enrol_stability'].to_numpy(dtype=np.float64))
     score_enrol = 0.5 * s_enrol_vol + 0.5 * s_enrol_stab
 
     # B. Compliance Score (Biometric)
     # Weight: 0.35
     # Critical Feature: Child Bio / Child Enrol Ratio
-    mbu_ratio = np.where(dist_stats['enrol_child_sum'] > 0,
-                         dist_stats['bio_child_sum'] / dist_stats['enrol_child_sum'], 0)
-    # mbu_ratio is already a numpy array, so reshape works
-    s_mbu = scaler.fit_transform(mbu_ratio.reshape(-1, 1)).flatten()
+    # divide(where=) only computes the lanes with enrolments (no 0/0 work or warnings)
+    enrol_child = dist_stats['enrol_child_sum'].to_numpy(dtype=np.float64)
+    mbu_ratio = np.divide(dist_stats['bio_child_sum'].to_numpy(dtype=np.float64), enrol_child,
+                          out=np.zeros(len(dist_stats)), where=enrol_child > 0)
+    s_mbu = _mm(mbu_ratio)
     score_bio = s_mbu
 
     # C. Accuracy Score (Demographic)
     # Weight: 0.25
-    s_demo_vol = scaler.fit_transform(dist_stats[['demo_total_vol']]).flatten()
+    s_demo_vol = _mm(demo_vol)
     score_demo = s_demo_vol
 
     # D. Infrastructure Score (Proxy)
     # Weight: 0.10
-    total_capacity = dist_stats['enrol_total_vol'] + dist_stats['bio_total_vol'] + dist_stats['demo_total_vol']
-
-    # --- THE FIX IS HERE ---
-    # Convert Series to Values (NumPy) before reshaping
-    score_infra = scaler.fit_transform(total_capacity.values.reshape(-1, 1)).flatten()
-    # -----------------------
+    total_capacity = enrol_vol + bio_vol + demo_vol
+    score_infra = _mm(total_capacity)
 
     # FINAL FORMULA
     dist_stats['health_index'] = (
@@ -223,6 +371,9 @@ def generate_health_index(df):
                                  ) * 100
 
     # Clustering (K-Means)
+    # Imported here: loading sklearn.cluster costs far more than fitting ~1k districts,
+    # and only this step needs it
+    from sklearn.cluster import KMeans
     X = np.column_stack((score_enrol, score_bio, score_demo))
     kmeans = KMeans(n_clusters=3, random_state=42, n_init=10)
     dist_stats['cluster'] = kmeans.fit_predict(X)
@@ -230,17 +381,17 @@ def generate_health_index(df):
     # Rank Clusters
     cluster_rank = dist_stats.groupby('cluster')['health_index'].mean().sort_values().index
     rank_map = {cluster_rank[0]: 'Critical Risk', cluster_rank[1]: 'Moderate', cluster_rank[2]: 'Healthy'}
-    dist_stats['risk_category'] = dist_stats['cluster'].map(rank_map)
+    # Categorical: filters like == 'Critical Risk' compare int8 codes, not Python strings
+    dist_stats['risk_category'] = pd.Categorical(dist_stats['cluster'].map(rank_map), categories=RISK_CATEGORIES)
 
     # Visualization
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(data=dist_stats, x='enrol_total_vol', y='health_index', hue='risk_category', palette='RdYlGn')
-    plt.xscale('log')
-    plt.title('Aadhaar Identity Health Index (Multi-Factor)')
-    plt.xlabel('Total Volume (Log Scale)')
-    plt.ylabel('Health Index (0-100)')
-    plt.savefig(os.path.join(OUTPUT_DIR, '4_Advanced_Health_Clusters.png'))
-    plt.close()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(data=dist_stats, x='enrol_total_vol', y='health_index', hue='risk_category', palette='RdYlGn', ax=ax)
+    ax.set_xscale('log')
+    ax.set_title('Aadhaar Identity Health Index (Multi-Factor)')
+    ax.set_xlabel('Total Volume (Log Scale)')
+    ax.set_ylabel('Health Index (0-100)')
+    _save_figures([(fig, '4_Advanced_Health_Clusters.png')])
 
     return dist_stats.sort_values('health_index')
 
@@ -253,16 +404,41 @@ def analyze_mbu_gap(df):
     if 'enrol_child_sum' not in df.columns: return
 
     # Aggregate Pincode features to District for plotting
-    dist = df.groupby('district')[['enrol_child_sum', 'bio_child_sum']].sum().reset_index()
+    dist = df.groupby('district', observed=True)[['enrol_child_sum', 'bio_child_sum']].sum().reset_index()
     dist['gap'] = dist['enrol_child_sum'] - dist['bio_child_sum']
-    top_risk = dist.sort_values('gap', ascending=False).head(10)
+    # Plain labels for plotting (a categorical axis would list every district)
+    top_risk = dist.sort_values('gap', ascending=False).head(10).astype({'district': str})
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(data=top_risk, x='gap', y='district', hue='district', palette='Reds_r', legend=False, ax=ax)
+    ax.set_title('Child Identity Risk Zones (Enrolment vs Update Gap)')
+    ax.set_xlabel('Gap Count (Enrolled but not Updated)')
+    _save_figures([(fig, '5_child_risk_gap.png')])
+
+
+def _daily_demo_volume(path):
+    """
+    Reduces one demographic chunk to its national daily volume (Series indexed by date).
+    Groups on the raw date strings first, so only the distinct days get parsed.
+    Returns None for an unreadable chunk (skipped by the caller).
+    """
+    try:
+        chunk = pd.read_csv(path, usecols=['date', 'demo_age_5_17', 'demo_age_17_'])
+    except Exception:
+        return None
+    daily = chunk.groupby('date')[['demo_age_5_17', 'demo_age_17_']].sum().sum(axis=1)
+    daily.index = pd.to_datetime(daily.index, format='%d-%m-%Y', errors='coerce')
+    # Unparseable dates are dropped, as the groupby on parsed dates did
+    return daily[daily.index.notna()].groupby(level=0).sum()
 
-    plt.figure(figsize=(10, 5))
-    sns.barplot(data=top_risk, x='gap', y='district', hue='district', palette='Reds_r', legend=False)
-    plt.title('Child Identity Risk Zones (Enrolment vs Update Gap)')
-    plt.xlabel('Gap Count (Enrolled but not Updated)')
-    plt.savefig(os.path.join(OUTPUT_DIR, '5_child_risk_gap.png'))
-    plt.close()
+
+def _z_anomalies(vols, threshold=3.0):
+    """
+    Z-scores a 1-D volume array and returns (z, positions where z > threshold).
+    Plain NumPy over the ~hundred daily points; sample std (ddof=1) as pandas .std() uses.
+    """
+    z = (vols - vols.mean()) / vols.std(ddof=1)
+    return z, np.flatnonzero(z > threshold)
 
 
 def analyze_fraud_spikes():
@@ -274,60 +450,54 @@ def analyze_fraud_spikes():
 
     # 1. Load ONLY Date and Counts (RAM-Safe Mode)
     # We ignore pincodes/districts here to keep it light
+    # 2. Aggregate to National Daily Volume
+    # Streamed: each file is reduced to its daily sums as soon as it is read, so only
+    # one raw chunk per reader thread is held, never the full raw frame.
+    # read_csv's C tokenizer releases the GIL, so the files parse in parallel threads.
     files = glob.glob(os.path.join(DATA_DIR, "api_data_aadhar_demographic_*.csv"))
-    dfs = []
-    for f in files:
-        try:
-            df = pd.read_csv(f, usecols=['date', 'demo_age_5_17', 'demo_age_17_'])
-            dfs.append(df)
-        except:
-            pass
-
-    if not dfs:
+    total = None
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(files), os.cpu_count() or 1))) as pool:
+        for daily in pool.map(_daily_demo_volume, files):
+            if daily is None: continue
+            total = daily if total is None else total.add(daily, fill_value=0)
+
+    if total is None:
         print("Skipping Sentinel - No Data Found.")
         return
 
-    raw_df = pd.concat(dfs, ignore_index=True)
-    raw_df['date'] = pd.to_datetime(raw_df['date'], format='%d-%m-%Y', errors='coerce')
-
-    # 2. Aggregate to National Daily Volume
-    daily_ts = raw_df.groupby('date')[['demo_age_5_17', 'demo_age_17_']].sum().sum(axis=1).reset_index()
-    daily_ts.columns = ['date', 'total_vol']
+    daily_ts = total.sort_index().rename_axis('date').reset_index(name='total_vol')
 
     # 3. Calculate Z-Score (The "Anomaly" Math)
-    mean_vol = daily_ts['total_vol'].mean()
-    std_vol = daily_ts['total_vol'].std()
-    daily_ts['z_score'] = (daily_ts['total_vol'] - mean_vol) / std_vol
-
     # 4. Detect Anomalies (> 3 Standard Deviations)
-    anomalies = daily_ts[daily_ts['z_score'] > 3]
+    z_score, spike_rows = _z_anomalies(daily_ts['total_vol'].to_numpy(dtype=np.float64))
+    daily_ts['z_score'] = z_score
+    anomalies = daily_ts.iloc[spike_rows]
     print(f"   [!] DETECTED {len(anomalies)} SUSPICIOUS DAYS (>3 Sigma)")
 
     # 5. Plot the Sentinel Chart
-    plt.figure(figsize=(12, 6))
+    fig, ax = plt.subplots(figsize=(12, 6))
 
     # Normal Flow (Grey)
-    plt.plot(daily_ts['date'], daily_ts['total_vol'], color='gray', alpha=0.5, label='Normal Daily Flow')
+    ax.plot(daily_ts['date'], daily_ts['total_vol'], color='gray', alpha=0.5, label='Normal Daily Flow')
 
     # Anomalies (Red)
     if not anomalies.empty:
-        plt.scatter(anomalies['date'], anomalies['total_vol'], color='red', s=100, label='Anomaly (>3σ)', zorder=5)
+        ax.scatter(anomalies['date'], anomalies['total_vol'], color='red', s=100, label='Anomaly (>3σ)', zorder=5)
 
         # Label the biggest spike automatically
         max_spike = anomalies.loc[anomalies['total_vol'].idxmax()]
-        plt.annotate(f"SUSPICIOUS SPIKE\n{max_spike['date'].strftime('%d-%b')}",
-                     (max_spike['date'], max_spike['total_vol']),
-                     xytext=(10, 10), textcoords='offset points',
-                     arrowprops=dict(arrowstyle="->", color='red', lw=2))
+        ax.annotate(f"SUSPICIOUS SPIKE\n{max_spike['date'].strftime('%d-%b')}",
+                    (max_spike['date'], max_spike['total_vol']),
+                    xytext=(10, 10), textcoords='offset points',
+                    arrowprops=dict(arrowstyle="->", color='red', lw=2))
 
-    plt.title('Security Sentinel: Automated Fraud Spike Detection')
-    plt.ylabel('Daily Volume')
-    plt.xlabel('Timeline')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
+    ax.set_title('Security Sentinel: Automated Fraud Spike Detection')
+    ax.set_ylabel('Daily Volume')
+    ax.set_xlabel('Timeline')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
 
-    plt.savefig(os.path.join(OUTPUT_DIR, '7_Anomaly_Sentinel.png'))
-    plt.close()
+    _save_figures([(fig, '7_Anomaly_Sentinel.png')])
 
 
 def analyze_pincode_variance(df):
@@ -338,40 +508,42 @@ def analyze_pincode_variance(df):
     print("Generating Pincode Variance Analysis...")
 
     # 1. Create a Total Load Column (The Fix)
-    df['total_load'] = df['enrol_total_vol'] + df['bio_total_vol'] + df['demo_total_vol']
+    # Kept as a local Series: the shared feature frame is left untouched
+    total_load = df['enrol_total_vol'] + df['bio_total_vol'] + df['demo_total_vol']
 
     # 2. Pick the busiest district based on TOTAL activity, not just Enrolment
-    top_district = df.groupby(['state', 'district'])['total_load'].sum().idxmax()
+    top_district = total_load.groupby([df['state'], df['district']], observed=True).sum().idxmax()
     state, dist_name = top_district
 
-    subset = df[(df['state'] == state) & (df['district'] == dist_name)].copy()
+    in_district = (df['state'] == state) & (df['district'] == dist_name)
+    subset = df[in_district].assign(total_load=total_load[in_district])
     if subset.empty: return
 
-    # 3. Sort by Total Load
-    subset = subset.sort_values('total_load', ascending=False)
+    # 3. Busiest 30 pincodes by Total Load (heap selection, no full sort of the district)
+    top_pincodes = subset.nlargest(30, 'total_load')
 
-    plt.figure(figsize=(12, 6))
+    fig, ax = plt.subplots(figsize=(12, 6))
 
     # Plot Total Load
-    sns.barplot(data=subset.head(30), x='pincode', y='total_load', palette='viridis')
-
-    plt.title(f'Intra-District Inequality: {dist_name}, {state}\n(Total Operational Load)', fontsize=14)
-    plt.ylabel('Total Transactions (Enrol + Update)')
-    plt.xlabel('Pincode')
-    plt.xticks(rotation=45)
-    plt.grid(axis='y', alpha=0.3)
-
-    # Annotation
-    std_dev = subset['total_load'].std()
-    mean_val = subset['total_load'].mean()
+    sns.barplot(data=top_pincodes.astype({'pincode': 'int64'}), x='pincode', y='total_load', palette='viridis', ax=ax)
+
+    ax.set_title(f'Intra-District Inequality: {dist_name}, {state}\n(Total Operational Load)', fontsize=14)
+    ax.set_ylabel('Total Transactions (Enrol + Update)')
+    ax.set_xlabel('Pincode')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(axis='y', alpha=0.3)
+
+    # Annotation (over every pincode in the district, not just the plotted 30)
+    load = subset['total_load'].to_numpy()
+    std_dev = np.std(load, ddof=1) if len(load) > 1 else np.nan
+    mean_val = load.mean()
     cv = std_dev / mean_val if mean_val > 0 else 0
 
-    plt.figtext(0.15, 0.8, f"High Service Variance (CV = {cv:.2f})\nWorkload is not distributed evenly.",
-                bbox={"facecolor": "white", "alpha": 0.8, "pad": 5})
+    fig.text(0.15, 0.8, f"High Service Variance (CV = {cv:.2f})\nWorkload is not distributed evenly.",
+             bbox={"facecolor": "white", "alpha": 0.8, "pad": 5})
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, '8_Pincode_Variance.png'))
-    plt.close()
+    fig.tight_layout()
+    _save_figures([(fig, '8_Pincode_Variance.png')])
 # You must add analyze_inequality to the import list in main.py!
 
 
@@ -0,0 +1,25 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Known raw CSV column types (all three UIDAI domains), shared by the analyzer and
+# preprocessor readers. Presetting them lets the Arrow reader skip type inference;
+# columns absent from a file are simply ignored.
+# Pincodes (6 digits) and per-row counts fit in int32: half the bytes for every pass
+CSV_COLUMN_TYPES = {
+    'date': pa.string(), 'state': pa.string(), 'district': pa.string(), 'pincode': pa.int32(),
+    'age_0_5': pa.int32(), 'age_5_17': pa.int32(), 'age_18_greater': pa.int32(),
+    'bio_age_5_17': pa.int32(), 'bio_age_17_': pa.int32(),
+    'demo_age_5_17': pa.int32(), 'demo_age_17_': pa.int32(),
+}
+
+
+def dictionary_encode(values):
+    """
+    Dictionary-encodes an Arrow array/column into one DictionaryArray (distinct values + int codes),
+    so per-value work can run once per distinct value and be gathered back through the codes.
+    """
+    encoded = pc.dictionary_encode(values)
+    if isinstance(encoded, pa.ChunkedArray):
+        # Multi-chunk input: merge per-chunk dictionaries into one (only the int codes are copied)
+        encoded = encoded.unify_dictionaries().combine_chunks()
+    return encoded
@@ -1,112 +1,255 @@
 import pandas as pd
-import glob
+import numpy as np
+import fnmatch
+import functools
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.arrow_utils import CSV_COLUMN_TYPES, dictionary_encode
 
 # Define where your files are
 DATA_DIR = "data/"
 
+# Raw columns each domain actually uses (pincode and anything else is never parsed)
+KEEP_COLS_BY_PREFIX = {
+    'enrol': ['date', 'state', 'district', 'age_0_5', 'age_5_17', 'age_18_greater'],
+    'bio': ['date', 'state', 'district', 'bio_age_5_17', 'bio_age_17_'],
+    'demo': ['date', 'state', 'district', 'demo_age_5_17', 'demo_age_17_'],
+}
+
+# Raw count columns -> domain-specific names (so the three domains don't clash in the merge)
+DOMAIN_RENAMES = {
+    'enrol': {'age_0_5': 'enrol_infant', 'age_5_17': 'enrol_child', 'age_18_greater': 'enrol_adult'},
+    'bio': {'bio_age_5_17': 'bio_child', 'bio_age_17_': 'bio_adult'},
+    'demo': {'demo_age_5_17': 'demo_child', 'demo_age_17_': 'demo_adult'},
+}
+
+# Known misspellings -> canonical state name. Keys are stored already normalized the way
+# clean_domain_df normalizes names (inner whitespace collapsed, title-cased, stripped),
+# so every lookup is a plain dict hit.
+STATE_MAP = {re.sub(r'\s+', ' ', k).title().strip(): v for k, v in {
+    'Westbengal': 'West Bengal', 'West  Bengal': 'West Bengal',
+    'Orissa': 'Odisha', 'Pondicherry': 'Puducherry',
+    'Uttaranchal': 'Uttarakhand', 'Delhi': 'NCT Of Delhi'
+}.items()}
+
+# District-Month keys shared by every cleaned domain (the merge keys)
+MERGE_KEYS = ['state', 'district', 'month']
+
+# What clean_domain_df returns for an empty domain: the post-aggregation key schema
+# (same dtypes as a real result), so the merge treats it like any other domain
+EMPTY_AGG = pd.DataFrame({
+    'state': pd.Series([], dtype=pd.ArrowDtype(pa.string())),
+    'district': pd.Series([], dtype=pd.ArrowDtype(pa.string())),
+    'month': pd.Series([], dtype=pd.ArrowDtype(pa.int32())),
+})
+
+# Threads for CSV parsing (releases the GIL). Set PANDAS_IO_THREADS=1 to read serially.
+IO_THREADS = int(os.getenv("PANDAS_IO_THREADS", os.cpu_count() or 1))
+
+
+@functools.lru_cache(maxsize=None)
+def _list_data_dir(data_dir):
+    """
+    Names of the files in data_dir, listed once per directory with a single scandir
+    (every load_and_combine_chunks call filters this instead of re-globbing the folder).
+    A missing directory lists as empty.
+    """
+    try:
+        with os.scandir(data_dir) as entries:
+            return tuple(sorted(e.name for e in entries if e.is_file()))
+    except FileNotFoundError:
+        return ()
+
+
+def _csv_options(columns=None):
+    """
+    Arrow read/convert options shared by the dataset scan and the per-file fallback.
+    """
+    return (pacsv.ReadOptions(block_size=16 << 20),
+            pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES, include_columns=columns))
+
+
+def _read_chunk(path, columns=None):
+    """
+    Parses one CSV part (optionally only `columns`) into an Arrow table (None if the file can't be read).
+    """
+    try:
+        read_options, convert_options = _csv_options(columns)
+        return pacsv.read_csv(path, read_options=read_options, convert_options=convert_options)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return None
+
 
-def load_and_combine_chunks(file_pattern):
+def load_and_combine_chunks(file_pattern, domain_prefix=None):
     """
     Step 1: Glues multiple CSV parts into one DataFrame.
     Example: 'enrolment_*.csv' -> One Enrolment DF
+    With a domain_prefix, only that domain's KEEP_COLS_BY_PREFIX columns are read.
     """
-    search_path = os.path.join(DATA_DIR, file_pattern)
-    files = glob.glob(search_path)
+    columns = KEEP_COLS_BY_PREFIX.get(domain_prefix)
+    files = [os.path.join(DATA_DIR, name) for name in fnmatch.filter(_list_data_dir(DATA_DIR), file_pattern)]
 
     if not files:
         print(f"WARNING: No files found for {file_pattern}")
         return pd.DataFrame()  # Return empty if missing
 
     print(f"Combining {len(files)} files for pattern: {file_pattern}...")
-    dfs = []
-    for f in files:
-        try:
-            df = pd.read_csv(f)
-            dfs.append(df)
-        except Exception as e:
-            print(f"Error reading {f}: {e}")
-
-    return pd.concat(dfs, ignore_index=True)
+    # One Arrow dataset scan over all parts: record batches stream into a single
+    # table (no per-file DataFrames and no concat copy); unused columns are projected
+    # away in the scan, so they are never converted
+    read_options, convert_options = _csv_options()
+    csv_format = ds.CsvFileFormat(read_options=read_options, convert_options=convert_options)
+    try:
+        table = ds.dataset(files, format=csv_format).to_table(columns=columns, use_threads=IO_THREADS > 1)
+    except pa.ArrowException as e:
+        # A bad part fails the whole scan: re-read per file so only that part is skipped
+        # (map keeps file order for the concat)
+        print(f"Error scanning {file_pattern}: {e}")
+        with ThreadPoolExecutor(max_workers=max(1, min(len(files), IO_THREADS))) as pool:
+            tables = [t for t in pool.map(functools.partial(_read_chunk, columns=columns), files) if t is not None]
+        if not tables:
+            return pd.DataFrame()
+        # concat_tables only links the per-file column chunks, and the ArrowDtype
+        # to_pandas below wraps them as-is: the parsed buffers are never copied
+        table = pa.concat_tables(tables)
+
+    # Arrow-backed columns: no conversion of strings into Python objects
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
 
 
 def clean_domain_df(df, domain_prefix):
     """
     Step 2: Cleans a specific domain (Demo, Bio, or Enrol).
     """
-    if df.empty: return df
+    if df.empty: return EMPTY_AGG.copy()
+
+    # Every step below is a pyarrow.compute kernel over one Arrow table, ending in a single
+    # Arrow group_by: no intermediate DataFrames and no Python str objects. Arrow-backed
+    # frames from load_and_combine_chunks convert zero-copy; any other frame (e.g. plain
+    # pd.read_csv output) is brought into Arrow here once.
+    table = pa.Table.from_pandas(df, preserve_index=False)
 
     # A. Standardize Column Names
     # (e.g., rename 'Age_0_5' to 'enrol_infant' so it doesn't clash later)
-    # You need to adjust these column names based on your actual CSV headers!
-    df.columns = df.columns.str.lower().str.strip()
-
-    # Example Renaming Logic (Customize this part!)
-    if domain_prefix == 'enrol':
-        df = df.rename(columns={'age_0_5': 'enrol_infant', 'age_5_17': 'enrol_child', 'age_18_greater': 'enrol_adult'})
-    elif domain_prefix == 'bio':
-        df = df.rename(columns={'bio_age_5_17': 'bio_child', 'bio_age_17_': 'bio_adult'})
-    elif domain_prefix == 'demo':
-        df = df.rename(columns={'demo_age_5_17': 'demo_child', 'demo_age_17_': 'demo_adult'})
+    # You need to adjust these column names based on your actual CSV headers! (DOMAIN_RENAMES)
+    # Lowercase/strip and the domain rename happen in one pass over the (tiny) name list
+    renames = DOMAIN_RENAMES.get(domain_prefix, {})
+    table = table.rename_columns([renames.get(name, name)
+                                  for name in (c.strip().lower() for c in table.column_names)])
 
     # B. Fix State Names (CRITICAL: Must apply to all 3 DFs)
-    df['state'] = df['state'].str.title().str.strip()
-    state_map = {
-        'Westbengal': 'West Bengal', 'West  Bengal': 'West Bengal',
-        'Orissa': 'Odisha', 'Pondicherry': 'Puducherry',
-        'Uttaranchal': 'Uttarakhand', 'Delhi': 'NCT Of Delhi'
-    }
-    df['state'] = df['state'].replace(state_map)
+    # Normalization runs once per distinct name (the dictionary), not per row,
+    # then the cleaned names are gathered back through the codes
+    states = dictionary_encode(table['state'])
+    names = pc.utf8_trim_whitespace(pc.utf8_title(pc.replace_substring_regex(states.dictionary, r'\s+', ' ')))
+    mapped = pc.take(pa.array(list(STATE_MAP.values())),
+                     pc.index_in(names, value_set=pa.array(list(STATE_MAP.keys()))))
+    state = pc.take(pc.coalesce(mapped, names), states.indices)
 
     # C. Date & Time Aggregation
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')  # Handle errors
-    df['month'] = df['date'].dt.to_period('M')
+    # strptime runs over the date dictionary (one parse per distinct day), gathered per row.
+    # int32 YYYYMM month key (e.g. 202503): plain integer hashing in the groupby and merges
+    dates = dictionary_encode(table['date'])
+    parsed = pc.strptime(dates.dictionary, format='%d-%m-%Y', unit='s', error_is_null=True)  # Handle errors
+    month_keys = pc.cast(pc.add(pc.multiply(pc.year(parsed), 100), pc.month(parsed)), pa.int32())
+    month = pc.take(month_keys, dates.indices)
 
     # D. Aggregate to District-Month level (To prepare for merging)
     # We group by State, District, Month so the rows match perfectly
-    group_cols = ['state', 'district', 'month']
-    numeric_cols = [c for c in df.columns if c not in group_cols and c != 'date' and c != 'pincode']
-
-    df_agg = df.groupby(group_cols)[numeric_cols].sum().reset_index()
-
-    return df_agg
-
-
-def generate_master_dataset():
+    group_cols = MERGE_KEYS
+    # Only arithmetic columns are summed (a stray text column can't slip into the aggregation)
+    numeric_cols = [f.name for f in table.schema
+                    if (pa.types.is_integer(f.type) or pa.types.is_floating(f.type))
+                    and f.name not in group_cols + ['pincode']]
+
+    # Rows with a missing key (e.g. an unparseable date) belong to no District-Month
+    agg_input = pa.table({'state': state, 'district': table['district'], 'month': month,
+                          **{c: table[c] for c in numeric_cols}})
+    has_keys = pc.and_(pc.and_(pc.is_valid(state), pc.is_valid(table['district'])), pc.is_valid(month))
+    agg_input = agg_input.filter(has_keys)
+
+    # Single hash aggregation (sums accumulate in int64; min_count=0 sums an all-null group to 0).
+    # use_threads=False keeps groups in first-seen order, so the output is deterministic.
+    grouped = agg_input.group_by(group_cols, use_threads=False).aggregate(
+        [(c, 'sum', pc.ScalarAggregateOptions(min_count=0)) for c in numeric_cols])
+    df_agg = grouped.select(group_cols + [f'{c}_sum' for c in numeric_cols]).rename_columns(group_cols + numeric_cols)
+
+    # District-Month totals stay int32 like the parsed counts (a column whose
+    # totals would overflow int32 keeps its int64 sums)
+    int32 = np.iinfo(np.int32)
+    for i, c in enumerate(numeric_cols, start=len(group_cols)):
+        if pa.types.is_integer(df_agg.schema.field(i).type) and len(df_agg):
+            bounds = pc.min_max(df_agg[c])
+            if bounds['min'].as_py() >= int32.min and bounds['max'].as_py() <= int32.max:
+                df_agg = df_agg.set_column(i, c, pc.cast(df_agg[c], pa.int32()))
+
+    return df_agg.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def generate_master_dataset(output_path=None):
     """
     Step 3: Orchestrates the whole process and Merges everything.
+    With an output_path, the master is also written there as Parquet.
     """
     # 1. Load & Combine Chunks
     print("--- Phase 1: Loading Chunks ---")
-    raw_enrol = load_and_combine_chunks("api_data_aadhar_enrolment_*.csv")  # Adjust pattern!
-    raw_bio = load_and_combine_chunks("api_data_aadhar_biometric_*.csv")
-    raw_demo = load_and_combine_chunks("api_data_aadhar_demographic_*.csv")
+    raw_enrol = load_and_combine_chunks("api_data_aadhar_enrolment_*.csv", 'enrol')  # Adjust pattern!
+    raw_bio = load_and_combine_chunks("api_data_aadhar_biometric_*.csv", 'bio')
+    raw_demo = load_and_combine_chunks("api_data_aadhar_demographic_*.csv", 'demo')
 
     # 2. Clean Separately
     print("\n--- Phase 2: Cleaning Domains ---")
-    clean_enrol = clean_domain_df(raw_enrol, 'enrol')
-    clean_bio = clean_domain_df(raw_bio, 'bio')
-    clean_demo = clean_domain_df(raw_demo, 'demo')
+    # The three domains are independent. clean_domain_df runs in Arrow compute kernels
+    # (GIL released), so threads overlap them without pickling frames to worker processes
+    raws, prefixes = [raw_enrol, raw_bio, raw_demo], ['enrol', 'bio', 'demo']
+    if IO_THREADS > 1:
+        with ThreadPoolExecutor(max_workers=min(len(raws), IO_THREADS)) as pool:
+            clean_enrol, clean_bio, clean_demo = pool.map(clean_domain_df, raws, prefixes)
+    else:
+        clean_enrol, clean_bio, clean_demo = map(clean_domain_df, raws, prefixes)
 
     # 3. Merge Together
     print("\n--- Phase 3: Merging to Master ---")
-    # Start with Enrolment, merge Biometric
-    if not clean_enrol.empty:
-        master = clean_enrol
-    else:
-        master = clean_bio  # Fallback if enrolment missing
-
-    if not clean_bio.empty:
-        master = pd.merge(master, clean_bio, on=['state', 'district', 'month'], how='outer')
-
-    if not clean_demo.empty:
-        master = pd.merge(master, clean_demo, on=['state', 'district', 'month'], how='outer')
+    # Every domain (empty ones included) carries the typed MERGE_KEYS schema, so the
+    # merge needs no per-domain fallbacks: an empty domain just aligns no rows
+    domains = [clean_enrol, clean_bio, clean_demo]
+
+    # State/District are factorized once across all domains: the join then hashes
+    # int32 codes instead of strings, and the labels are restored afterwards
+    labels = {}
+    for col in ['state', 'district']:
+        names = pd.unique(np.concatenate([df[col].to_numpy(dtype=object) for df in domains]))
+        labels[col] = pd.Index(names, dtype=pd.ArrowDtype(pa.string()))
+        domains = [df.assign(**{col: labels[col].get_indexer(df[col]).astype(np.int32)}) for df in domains]
+
+    # Enrolment, Biometric and Demographic are outer-aligned on the keys in one pass
+    # (each domain indexed once) instead of two chained merges; missing domains are skipped
+    master = pd.concat([df.set_index(MERGE_KEYS) for df in domains], axis=1, join='outer').reset_index()
+    for col, names in labels.items():
+        master[col] = names.take(master[col].to_numpy())
 
     # Fill NaNs with 0 (Crucial for Outer Joins)
-    master = master.fillna(0)
+    # Only value columns the join left gaps in; Arrow-backed columns fill via fill_null on the validity mask
+    for col in master.columns.drop(MERGE_KEYS):
+        if master[col].hasnans:
+            master[col] = master[col].fillna(0)
+
+    if output_path:
+        # State/District repeat on every row: dictionary pages store each name once
+        # (ints per row), and zstd keeps the file small; row groups bound read-back memory
+        pq.write_table(pa.Table.from_pandas(master, preserve_index=False), output_path,
+                       compression='zstd', use_dictionary=['state', 'district'], row_group_size=1 << 20)
+        print(f"Master Dataset written to {output_path}")
 
     print(f"SUCCESS: Master Dataset Created with {len(master)} rows.")
     return master
 
 # To run it:
-# df = generate_master_dataset()
\ No newline at end of file
+# df = generate_master_dataset()  # or generate_master_dataset("output/master.parquet")
\ No newline at end of file